@@ -3,12 +3,18 @@ Item Loader
 
 See documentation in docs/topics/loaders.rst
 """
+import re
 from contextlib import suppress
+from functools import lru_cache, partial
+from types import FunctionType
 
 from itemadapter import ItemAdapter
+from lxml import etree
+from parsel import Selector, SelectorList
+from parsel.csstranslator import GenericTranslator, HTMLTranslator
 from parsel.utils import extract_regex, flatten
 
-from itemloaders.common import wrap_loader_context
+from itemloaders.common import takes_loader_context
 from itemloaders.processors import Identity
 from itemloaders.utils import arg_to_iter
 
@@ -24,7 +30,151 @@ def unbound_method(method):
     return method
 
 
-class ItemLoader:
+@lru_cache(maxsize=256)
+def _compile_regex(regex):
+    return re.compile(regex)
+
+
+_html_translator = HTMLTranslator()
+_xml_translator = GenericTranslator()
+
+
+@lru_cache(maxsize=256)
+def _compile_xpath(query, namespaces):
+    """
+    Return a compiled ``lxml.etree.XPath`` for the given ``query`` and
+    ``namespaces`` (a sorted tuple of ``(prefix, uri)`` pairs), so that the
+    same expression is only parsed once across selectors
+    """
+    return etree.XPath(
+        query, namespaces=dict(namespaces), regexp=True, smart_strings=False
+    )
+
+
+@lru_cache(maxsize=256)
+def _css_to_xpath(query, selector_type):
+    """Translate a CSS selector into XPath, caching the translation"""
+    if selector_type == 'xml':
+        return _xml_translator.css_to_xpath(query)
+    return _html_translator.css_to_xpath(query)
+
+
+def _select_xpath(selector, query, namespaces=None, **kw):
+    """
+    Equivalent to ``selector.xpath(query, namespaces, **kw).getall()``, but
+    evaluating a cached compiled expression against the selector root.
+
+    ``query`` may also be an already compiled ``lxml.etree.XPath``, in
+    which case it is evaluated as is and ``namespaces`` is ignored.
+
+    Selectors which override :meth:`~parsel.selector.Selector.xpath`,
+    anything that is not a plain lxml tree, as well as invalid expressions,
+    are delegated to the selector itself.
+    """
+    compiled = isinstance(query, etree.XPath)
+    expr = query.path if compiled else query
+    if isinstance(selector, list):  # SelectorList, e.g. in nested loaders
+        if type(selector).xpath is not SelectorList.xpath:
+            return selector.xpath(expr, namespaces=namespaces, **kw).getall()
+        values = []
+        for sel in selector:
+            values.extend(_select_xpath(sel, query, namespaces, **kw))
+        return values
+    root = selector.root
+    if (type(selector).xpath is not Selector.xpath
+            or not isinstance(root, etree._Element)):
+        return selector.xpath(expr, namespaces=namespaces, **kw).getall()
+    try:
+        if compiled:
+            xpath = query
+        else:
+            nsp = dict(selector.namespaces)
+            if namespaces is not None:
+                nsp.update(namespaces)
+            xpath = _compile_xpath(query, tuple(sorted(nsp.items())))
+        result = xpath(root, **kw)
+    except etree.XPathError as e:
+        if compiled:
+            raise ValueError('XPath error: %s in %s' % (e, expr))
+        # let the selector raise its own error
+        return selector.xpath(query, namespaces=namespaces, **kw).getall()
+    if not isinstance(result, list):
+        result = [result]
+    cls = selector.__class__
+    return [
+        cls(root=x, namespaces=selector.namespaces, type=selector.type).get()
+        for x in result
+    ]
+
+
+def _select_css(selector, query):
+    """
+    Equivalent to ``selector.css(query).getall()``, reusing cached CSS to
+    XPath translations and compiled XPath expressions.
+
+    ``query`` may also be an already compiled ``lxml.etree.XPath``, such
+    as a ``lxml.cssselect.CSSSelector``.
+
+    Selectors which override :meth:`~parsel.selector.Selector.css` or
+    :meth:`~parsel.selector.Selector.xpath` are delegated to the selector
+    itself.
+    """
+    if isinstance(query, etree.XPath):
+        return _select_xpath(selector, query)
+    if isinstance(selector, list):  # SelectorList, e.g. in nested loaders
+        if type(selector).css is not SelectorList.css:
+            return selector.css(query).getall()
+        values = []
+        for sel in selector:
+            values.extend(_select_css(sel, query))
+        return values
+    if (type(selector).css is not Selector.css
+            or type(selector).xpath is not Selector.xpath
+            or not isinstance(selector.root, etree._Element)):
+        return selector.css(query).getall()
+    return _select_xpath(selector, _css_to_xpath(query, selector.type))
+
+
+_PROCESSOR_CACHE_SIZE = 1024
+
+
+def _is_plain_class_attr(cls, name):
+    """
+    Return whether getting ``name`` from instances of ``cls`` does not depend
+    on the instance, i.e. it is not a property or some other descriptor,
+    beyond functions, static methods and class methods
+    """
+    for klass in cls.__mro__:
+        if name in vars(klass):
+            value = vars(klass)[name]
+            return (
+                not hasattr(type(value), '__get__')
+                or isinstance(value, (FunctionType, staticmethod, classmethod))
+            )
+    return True
+
+
+class _ItemLoaderMeta(type):
+    """
+    Invalidate the processors cached for a loader class, and its subclasses,
+    whenever one of its attributes is set or deleted
+    """
+
+    def __setattr__(cls, name, value):
+        super().__setattr__(name, value)
+        cls._clear_processor_caches()
+
+    def __delattr__(cls, name):
+        super().__delattr__(name)
+        cls._clear_processor_caches()
+
+    def _clear_processor_caches(cls):
+        for cache in (ItemLoader._input_processors, ItemLoader._output_processors):
+            for key in [key for key in cache if issubclass(key[0], cls)]:
+                del cache[key]
+
+
+class ItemLoader(metaclass=_ItemLoaderMeta):
     """
     Return a new Item Loader for populating the given item. If no item is
     given, one is instantiated automatically using the class in
@@ -86,6 +236,17 @@ class ItemLoader:
         The default output processor to use for those fields which don't specify
         one.
 
+    .. attribute:: combine_multi_xpath
+
+        If ``True``, when several XPath expressions are given at once to
+        :meth:`add_xpath`, :meth:`replace_xpath` or :meth:`get_xpath`, they
+        are evaluated as a single union expression, walking the document only
+        once. The resulting values are then in document order, rather than in
+        the order of the expressions, and nodes matched by several
+        expressions are only returned once. Expressions that cannot be
+        combined (e.g. those not returning nodes) are evaluated separately.
+        ``False`` by default.
+
     .. attribute:: selector
 
         The :class:`~parsel.selector.Selector` object to extract data from.
@@ -98,6 +259,10 @@ class ItemLoader:
     default_item_class = dict
     default_input_processor = Identity()
     default_output_processor = Identity()
+    combine_multi_xpath = False
+
+    _input_processors = {}
+    _output_processors = {}
 
     def __init__(self, item=None, selector=None, parent=None, **context):
         self.selector = selector
@@ -109,17 +274,31 @@ class ItemLoader:
         self.context = context
         self.parent = parent
         self._local_values = {}
-        # values from initial item
-        for field_name, value in ItemAdapter(item).items():
-            self._values.setdefault(field_name, [])
-            self._values[field_name] += arg_to_iter(value)
+        if parent is not None:
+            # nested loaders share the item and collected values of their
+            # parent, which already took the initial item values
+            self._values_root = parent._values_root
+            self._adapter = parent._adapter
+        else:
+            self._values_root = self._local_values
+            self._adapter = ItemAdapter(item)
+            self._add_initial_values()
+
+    def _add_initial_values(self):
+        values = self._local_values
+        for field_name, value in self._adapter.items():
+            if isinstance(value, (list, tuple)):
+                values[field_name] = list(value)
+            elif value is None:
+                values[field_name] = []
+            else:
+                values[field_name] = list(arg_to_iter(value))
 
     @property
     def _values(self):
-        if self.parent is not None:
-            return self.parent._values
-        else:
-            return self._local_values
+        # resolved in __init__, nested loaders share the values of the
+        # top-level loader
+        return self._values_root
 
     @property
     def item(self):
@@ -206,9 +385,13 @@ class ItemLoader:
     def _add_value(self, field_name, value):
         value = arg_to_iter(value)
         processed_value = self._process_input_value(field_name, value)
-        if processed_value:
-            self._values.setdefault(field_name, [])
-            self._values[field_name] += arg_to_iter(processed_value)
+        if not processed_value:
+            return
+        values = self._values.setdefault(field_name, [])
+        if isinstance(processed_value, (list, tuple)):
+            values.extend(processed_value)
+        else:
+            values.extend(arg_to_iter(processed_value))
 
     def _replace_value(self, field_name, value):
         self._values.pop(field_name, None)
@@ -236,14 +419,20 @@ class ItemLoader:
         """
         regex = kw.get('re', None)
         if regex:
+            if isinstance(regex, str):
+                regex = _compile_regex(regex)
             value = arg_to_iter(value)
             value = flatten(extract_regex(regex, x) for x in value)
+        if not processors:
+            return value
 
+        context = self.context
         for proc in processors:
             if value is None:
                 break
             _proc = proc
-            proc = wrap_loader_context(proc, self.context)
+            if takes_loader_context(proc):
+                proc = partial(proc, loader_context=context)
             try:
                 value = proc(value)
             except Exception as e:
@@ -257,9 +446,14 @@ class ItemLoader:
         Populate the item with the data collected so far, and return it. The
         data collected is first passed through the :ref:`output processors
         <processors>` to get the final value to assign to each item field.
+        Fields without collected data are left untouched.
         """
-        adapter = ItemAdapter(self.item)
-        for field_name in tuple(self._values):
+        adapter = self._adapter
+        values = self._values_root
+        # output processors (e.g. loader methods) may add values
+        for field_name in tuple(values):
+            if not values[field_name]:
+                continue
             value = self.get_output_value(field_name)
             if value is not None:
                 adapter[field_name] = value
@@ -272,8 +466,11 @@ class ItemLoader:
         given field. This method doesn't populate or modify the item at all.
         """
         proc = self.get_output_processor(field_name)
-        proc = wrap_loader_context(proc, self.context)
         value = self._values.get(field_name, [])
+        if type(proc) is Identity:
+            return value
+        if takes_loader_context(proc):
+            proc = partial(proc, loader_context=self.context)
         try:
             return proc(value)
         except Exception as e:
@@ -285,33 +482,62 @@ class ItemLoader:
         return self._values.get(field_name, [])
 
     def get_input_processor(self, field_name):
-        proc = getattr(self, '%s_in' % field_name, None)
-        if not proc:
-            proc = self._get_item_field_attr(
-                field_name,
-                'input_processor',
-                self.default_input_processor
-            )
-        return unbound_method(proc)
+        return self._get_processor(
+            field_name, '_in', 'input_processor', 'default_input_processor',
+            self._input_processors,
+        )
 
     def get_output_processor(self, field_name):
-        proc = getattr(self, '%s_out' % field_name, None)
+        return self._get_processor(
+            field_name, '_out', 'output_processor', 'default_output_processor',
+            self._output_processors,
+        )
+
+    def _get_processor(self, field_name, suffix, key, default_attr, cache):
+        # Processors usually only depend on the loader class and the item
+        # class, so they are resolved once per (loader class, item class,
+        # field), unless they are set on the loader instance or come from a
+        # property or other descriptor. Setting loader class attributes
+        # invalidates the cache (see _ItemLoaderMeta).
+        attr = field_name + suffix
+        instance_attrs = self.__dict__
+        cacheable = attr not in instance_attrs and default_attr not in instance_attrs
+        if cacheable:
+            cache_key = (type(self), type(self.item), field_name)
+            try:
+                return cache[cache_key]
+            except KeyError:
+                pass
+        proc = getattr(self, attr, None)
         if not proc:
             proc = self._get_item_field_attr(
-                field_name,
-                'output_processor',
-                self.default_output_processor
+                field_name, key, getattr(self, default_attr)
             )
-        return unbound_method(proc)
+        proc = unbound_method(proc)
+        if (
+            cacheable
+            # methods using self are bound to this particular loader
+            and getattr(proc, '__self__', None) is not self
+            # properties and other descriptors may depend on the loader too
+            and _is_plain_class_attr(type(self), attr)
+            and _is_plain_class_attr(type(self), default_attr)
+        ):
+            if len(cache) >= _PROCESSOR_CACHE_SIZE:
+                cache.clear()
+            cache[cache_key] = proc
+        return proc
 
     def _get_item_field_attr(self, field_name, key, default=None):
-        field_meta = ItemAdapter(self.item).get_field_meta(field_name)
+        field_meta = self._adapter.get_field_meta(field_name)
         return field_meta.get(key, default)
 
     def _process_input_value(self, field_name, value):
         proc = self.get_input_processor(field_name)
+        if type(proc) is Identity:
+            return value
         _proc = proc
-        proc = wrap_loader_context(proc, self.context)
+        if takes_loader_context(proc):
+            proc = partial(proc, loader_context=self.context)
         try:
             return proc(value)
         except Exception as e:
@@ -336,7 +562,7 @@ class ItemLoader:
         See :meth:`get_xpath` for ``kwargs``.
 
         :param xpath: the XPath to extract data from
-        :type xpath: str
+        :type xpath: str or ``lxml.etree.XPath``
 
         Examples::
 
@@ -362,8 +588,10 @@ class ItemLoader:
         value, which is used to extract a list of unicode strings from the
         selector associated with this :class:`ItemLoader`.
 
-        :param xpath: the XPath to extract data from
-        :type xpath: str
+        :param xpath: the XPath to extract data from. An already compiled
+            ``lxml.etree.XPath`` object is evaluated as is, which saves
+            compiling the same expression for every page.
+        :type xpath: str or ``lxml.etree.XPath``
 
         :param re: a regular expression to use for extracting data from the
             selected XPath region
@@ -375,6 +603,9 @@ class ItemLoader:
             loader.get_xpath('//p[@class="product-name"]')
             # HTML snippet: <p id="price">the price is $1200</p>
             loader.get_xpath('//p[@id="price"]', TakeFirst(), re='the price is (.*)')
+            # the same, with a pre-compiled XPath
+            price_xpath = lxml.etree.XPath('//p[@id="price"]')
+            loader.get_xpath(price_xpath, TakeFirst(), re='the price is (.*)')
 
         """
         values = self._get_xpathvalues(xpath, **kw)
@@ -382,8 +613,20 @@ class ItemLoader:
 
     def _get_xpathvalues(self, xpaths, **kw):
         self._check_selector_method()
+        selector = self.selector
+        if isinstance(xpaths, (str, etree.XPath)):
+            return _select_xpath(selector, xpaths, **kw)
         xpaths = arg_to_iter(xpaths)
-        return flatten(self.selector.xpath(xpath, **kw).getall() for xpath in xpaths)
+        if self.combine_multi_xpath:
+            xpaths = list(xpaths)
+            if len(xpaths) > 1 and all(isinstance(x, str) for x in xpaths):
+                union = ' | '.join('(%s)' % xpath for xpath in xpaths)
+                with suppress(ValueError):
+                    return _select_xpath(selector, union, **kw)
+        values = []
+        for xpath in xpaths:
+            values.extend(_select_xpath(selector, xpath, **kw))
+        return values
 
     def add_css(self, field_name, css, *processors, **kw):
         """
@@ -394,7 +637,7 @@ class ItemLoader:
         See :meth:`get_css` for ``kwargs``.
 
         :param css: the CSS selector to extract data from
-        :type css: str
+        :type css: str or ``lxml.etree.XPath``
 
         Examples::
 
@@ -419,8 +662,10 @@ class ItemLoader:
         instead of a value, which is used to extract a list of unicode strings
         from the selector associated with this :class:`ItemLoader`.
 
-        :param css: the CSS selector to extract data from
-        :type css: str
+        :param css: the CSS selector to extract data from. An already compiled
+            ``lxml.etree.XPath`` object, such as a
+            ``lxml.cssselect.CSSSelector``, is evaluated as is.
+        :type css: str or ``lxml.etree.XPath``
 
         :param re: a regular expression to use for extracting data from the
             selected CSS region
@@ -432,11 +677,19 @@ class ItemLoader:
             loader.get_css('p.product-name')
             # HTML snippet: <p id="price">the price is $1200</p>
             loader.get_css('p#price', TakeFirst(), re='the price is (.*)')
+            # the same, with a pre-compiled CSS selector
+            price_css = lxml.cssselect.CSSSelector('p#price')
+            loader.get_css(price_css, TakeFirst(), re='the price is (.*)')
         """
         values = self._get_cssvalues(css, **kw)
         return self.get_value(values, *processors, **kw)
 
     def _get_cssvalues(self, csss, **kw):
         self._check_selector_method()
-        csss = arg_to_iter(csss)
-        return flatten(self.selector.css(css).getall() for css in csss)
+        selector = self.selector
+        if isinstance(csss, (str, etree.XPath)):
+            return _select_css(selector, csss)
+        values = []
+        for css in arg_to_iter(csss):
+            values.extend(_select_css(selector, css))
+        return values
@@ -1,14 +1,34 @@
 """Common functions used in Item Loaders code"""
 
 from functools import partial
+from weakref import WeakKeyDictionary
+
 from itemloaders.utils import get_func_args
 
 
+# weak keys, so that memoizing a processor does not keep it (and whatever it
+# references, e.g. a response or a loader) alive
+_takes_loader_context_cache = WeakKeyDictionary()
+
+
+def takes_loader_context(function):
+    """Return whether the given callable receives a loader_context argument"""
+    try:
+        return _takes_loader_context_cache[function]
+    except KeyError:
+        pass
+    except TypeError:  # unhashable or not weak-referenceable
+        return 'loader_context' in get_func_args(function)
+    result = 'loader_context' in get_func_args(function)
+    _takes_loader_context_cache[function] = result
+    return result
+
+
 def wrap_loader_context(function, context):
     """Wrap functions that receive loader_context to contain the context
     "pre-loaded" and expose a interface that receives only one argument
     """
-    if 'loader_context' in get_func_args(function):
+    if takes_loader_context(function):
         return partial(function, loader_context=context)
     else:
         return function
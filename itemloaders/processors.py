@@ -192,12 +192,25 @@ class SelectJmes:
     >>> proc_json_list = Compose(json.loads, MapCompose(SelectJmes('foo')))
     >>> proc_json_list('[{"foo":"bar"}, {"baz":"tar"}]')
     ['bar']
+
+    An expression already compiled with ``jmespath.compile()`` is also
+    accepted:
+
+    >>> import jmespath
+    >>> proc = SelectJmes(jmespath.compile("foo"))
+    >>> proc({'foo': 'bar'})
+    'bar'
     """
 
     def __init__(self, json_path):
-        self.json_path = json_path
         import jmespath
-        self.compiled_path = jmespath.compile(self.json_path)
+        from jmespath.parser import ParsedResult
+        if isinstance(json_path, ParsedResult):
+            self.json_path = json_path.expression
+            self.compiled_path = json_path
+        else:
+            self.json_path = json_path
+            self.compiled_path = jmespath.compile(self.json_path)
 
     def __call__(self, value):
         """Query value for the jmespath query and return answer
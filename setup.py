@@ -42,6 +42,7 @@ setup(
         'parsel>=1.5.0',
         'jmespath>=0.9.5',
         'itemadapter>=0.1.0',
+        'lxml>=3.5.0',
     ],
     # extras_require=extras_require,
 )
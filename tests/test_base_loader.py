@@ -1,7 +1,12 @@
 from functools import partial
+import gc
+import re
 import unittest
+import weakref
 
-from itemloaders import ItemLoader
+from parsel.utils import extract_regex, flatten
+
+from itemloaders import ItemLoader, _PROCESSOR_CACHE_SIZE
 from itemloaders.processors import Compose, Identity, Join, MapCompose, TakeFirst
 
 
@@ -63,6 +68,30 @@ class BasicItemLoaderTest(unittest.TestCase):
         il.replace_value('sku', [valid_fragment], re=sku_re)
         self.assertEqual(il.load_item()['sku'], '1234')
 
+    def test_load_item_skip_empty_field_values(self):
+        class MyLoader(ItemLoader):
+            name_out = Compose(lambda vs: vs[0])
+
+        il = MyLoader(item={'name': None, 'url': []})
+        assert il.load_item() == {'name': None, 'url': []}
+        il.add_value('name', 'marta')
+        assert il.load_item() == {'name': 'marta', 'url': []}
+
+        assert ItemLoader(item={'a': None}).load_item() == {'a': None}
+
+    def test_load_item_empty_field_default_not_applied(self):
+        class MyLoader(ItemLoader):
+            default_output_processor = Compose(lambda v: v or ['n/a'])
+
+        # fields with no collected values are not passed to output processors
+        il = MyLoader(item={'name': None, 'url': []})
+        assert il.load_item() == {'name': None, 'url': []}
+        # the processor still applies to fields with collected values
+        il.add_value('name', ['', 'marta'])
+        assert il.load_item() == {'name': ['', 'marta'], 'url': []}
+        # and to get_output_value, which does not skip empty fields
+        assert il.get_output_value('url') == ['n/a']
+
     def test_self_referencing_loader(self):
         class MyLoader(ItemLoader):
             url_out = TakeFirst()
@@ -82,6 +111,29 @@ class BasicItemLoaderTest(unittest.TestCase):
         il.add_value('img_url', '1234.png')
         assert il.load_item() == {'img_url': '1234.png'}
 
+    def test_load_item_get_output_value_override(self):
+        class MyLoader(ItemLoader):
+            def get_output_value(self, field_name):
+                if field_name == 'name':
+                    self.add_value('name_upper', self.get_collected_values('name')[0].upper())
+                return super().get_output_value(field_name)
+
+        il = MyLoader(item={})
+        il.add_value('name', 'marta')
+        self.assertEqual(il.load_item(), {'name': ['marta']})
+        self.assertEqual(il.get_collected_values('name_upper'), ['MARTA'])
+
+    def test_load_item_output_processor_adds_values(self):
+        class MyLoader(ItemLoader):
+            def name_out(self, values):
+                self.add_value('other', 'x')
+                return values
+
+        il = MyLoader(item={})
+        il.add_value('name', 'a')
+        self.assertEqual(il.load_item(), {'name': ['a']})
+        self.assertEqual(il.get_collected_values('other'), ['x'])
+
     def test_add_value(self):
         il = CustomItemLoader()
         il.add_value('name', 'marta')
@@ -233,6 +285,20 @@ class BasicItemLoaderTest(unittest.TestCase):
         il.add_value('name', 'marta')
         self.assertEqual(il.get_output_value('name'), ['marta'])
 
+    def test_identity_subclass_processors(self):
+        class UpperIdentity(Identity):
+            def __call__(self, values):
+                return [v.upper() for v in values]
+
+        class SubclassedIdentityItemLoader(ItemLoader):
+            default_input_processor = UpperIdentity()
+            default_output_processor = Compose(UpperIdentity(), TakeFirst())
+
+        il = SubclassedIdentityItemLoader()
+        il.add_value('name', 'marta')
+        self.assertEqual(il.get_collected_values('name'), ['MARTA'])
+        self.assertEqual(il.get_output_value('name'), 'MARTA')
+
     def test_extend_custom_input_processors(self):
         class ChildItemLoader(CustomItemLoader):
             name_in = MapCompose(CustomItemLoader.name_in, str.swapcase)
@@ -315,6 +381,81 @@ class BasicItemLoaderTest(unittest.TestCase):
         il.add_value('name', ['mar', 'ta'])
         self.assertEqual(il.get_output_value('name'), ['Mar', 'Ta'])
 
+    def test_processors_resolved_once(self):
+        class ChildItemLoader(CustomItemLoader):
+            pass
+
+        il = ChildItemLoader()
+        proc = il.get_input_processor('name')
+        self.assertEqual(ChildItemLoader._input_processors[(ChildItemLoader, dict, 'name')], proc)
+        self.assertIs(ChildItemLoader().get_input_processor('name'), proc)
+
+    def test_class_processor_reassignment(self):
+        class MyLoader(ItemLoader):
+            pass
+
+        class ChildLoader(MyLoader):
+            pass
+
+        def load(loader_class):
+            il = loader_class()
+            il.add_value('name', ['marta', 'pepe'])
+            return il.load_item()
+
+        self.assertEqual(load(MyLoader), {'name': ['marta', 'pepe']})
+        self.assertEqual(load(ChildLoader), {'name': ['marta', 'pepe']})
+        MyLoader.default_output_processor = TakeFirst()
+        self.assertEqual(load(MyLoader), {'name': 'marta'})
+        MyLoader.name_in = MapCompose(str.upper)
+        self.assertEqual(load(MyLoader), {'name': 'MARTA'})
+        self.assertEqual(load(ChildLoader), {'name': 'MARTA'})
+        del MyLoader.name_in
+        del MyLoader.default_output_processor
+        self.assertEqual(load(ChildLoader), {'name': ['marta', 'pepe']})
+
+    def test_property_processors_not_cached(self):
+        class MyLoader(ItemLoader):
+            @property
+            def name_in(self):
+                return MapCompose(lambda v: v + self.context['suffix'])
+
+        il = MyLoader(suffix='-a')
+        il.add_value('name', 'x')
+        self.assertEqual(il.get_collected_values('name'), ['x-a'])
+        il = MyLoader(suffix='-b')
+        il.add_value('name', 'x')
+        self.assertEqual(il.get_collected_values('name'), ['x-b'])
+
+    def test_processor_cache_bounded(self):
+        il = CustomItemLoader()
+        il.add_value(None, {'field%d' % i: 'x' for i in range(_PROCESSOR_CACHE_SIZE + 10)})
+        self.assertLessEqual(len(ItemLoader._input_processors), _PROCESSOR_CACHE_SIZE)
+        il.add_value('name', 'marta')
+        self.assertEqual(il.get_collected_values('name'), ['Marta'])
+
+    def test_plain_loader_instance_processor_override(self):
+        il = ItemLoader()
+        il.default_output_processor = TakeFirst()
+        il.add_value('name', ['marta', 'pepe'])
+        self.assertEqual(il.load_item(), {'name': 'marta'})
+
+    def test_instance_processor_override(self):
+        il = CustomItemLoader()
+        il.add_value('name', 'marta')
+        self.assertEqual(il.get_output_value('name'), ['Marta'])
+
+        il = CustomItemLoader()
+        il.default_output_processor = TakeFirst()
+        il.add_value('name', 'marta')
+        self.assertEqual(il.get_output_value('name'), 'Marta')
+        il.name_in = MapCompose(str.upper)
+        il.replace_value('name', 'marta')
+        self.assertEqual(il.get_output_value('name'), 'MARTA')
+
+        il = CustomItemLoader()
+        il.add_value('name', 'marta')
+        self.assertEqual(il.get_output_value('name'), ['Marta'])
+
     def test_loader_context_on_declaration(self):
         class ChildItemLoader(CustomItemLoader):
             url_in = MapCompose(processor_with_args, key='val')
@@ -346,6 +487,51 @@ class BasicItemLoaderTest(unittest.TestCase):
         il.replace_value('url', 'text2')
         self.assertEqual(il.get_output_value('url'), ['val'])
 
+    def test_loader_context_unhashable_processor(self):
+        class UnhashableProcessor:
+            __hash__ = None
+
+            def __call__(self, value, loader_context):
+                return [loader_context['key']]
+
+        il = ItemLoader(key='val')
+        self.assertEqual(il.get_value('text', UnhashableProcessor()), ['val'])
+
+    def test_get_value_regex_matches_extract_regex(self):
+        values = ['name: foo', 'name: bar baz', 'name:&amp;', 'no match', 'name: 1 &lt; 2']
+        for regex in (
+            r'name: (.*)$', r'name: (\w+)', r'(\w+)', r'name: (?P<extract>\w+)',
+            r'name: (\w+) (\w+)', r'name:(.*)', r'\d', re.compile(r'NAME: (.*)$', re.I),
+        ):
+            expected = flatten(extract_regex(regex, value) for value in values)
+            self.assertEqual(ItemLoader().get_value(values, re=regex), expected, regex)
+
+    def test_processors_not_kept_alive(self):
+        class Response:
+            def urljoin(self, value):
+                return 'http://example.com/' + value
+
+        class MyLoader(ItemLoader):
+            def name_in(self, values):
+                return values
+
+        response = Response()
+        il = MyLoader()
+        il.add_value('url', 'a', MapCompose(response.urljoin))
+        il.add_value('name', 'marta')
+        self.assertEqual(il.load_item(), {'url': ['http://example.com/a'], 'name': ['marta']})
+        response_ref, loader_ref = weakref.ref(response), weakref.ref(il)
+        del response, il
+        gc.collect()
+        self.assertIsNone(response_ref())
+        self.assertIsNone(loader_ref())
+
+    def test_get_value_without_processors(self):
+        il = ItemLoader()
+        value = ['foo', 'bar']
+        self.assertIs(il.get_value(value), value)
+        self.assertEqual(il.get_value(None), None)
+
     def test_item_passed_to_input_processor_functions(self):
         def processor(value, loader_context):
             return loader_context['item']['name']
@@ -89,6 +89,23 @@ class InitializationTestMixin:
         il = ItemLoader(item=input_item)
         self.assertEqual(il._values.get('name'), ['foo', 'bar'])
 
+    def test_values_copied(self):
+        """Values from initial item must not be modified by the loader"""
+        names = ['foo']
+        input_item = self.item_class(name=names)
+        il = ItemLoader(item=input_item)
+        il.add_value('name', 'bar')
+        self.assertEqual(names, ['foo'])
+        self.assertEqual(il._values.get('name'), ['foo', 'bar'])
+
+    def test_values_other_types(self):
+        """Values from initial item must be added to loader._values"""
+        input_item = self.item_class(name=('foo', 'bar'), url=None, summary={'a'})
+        il = ItemLoader(item=input_item)
+        self.assertEqual(il._values.get('name'), ['foo', 'bar'])
+        self.assertEqual(il._values.get('url'), [])
+        self.assertEqual(il._values.get('summary'), ['a'])
+
 
 class InitializationFromDictTest(InitializationTestMixin, unittest.TestCase):
     item_class = dict
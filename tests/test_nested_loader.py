@@ -98,3 +98,12 @@ class SubselectorLoaderTest(unittest.TestCase):
         self.assertEqual(item['name'], ['marta'])
         self.assertEqual(item['url'], ['http://www.scrapy.org'])
         self.assertEqual(item['image'], ['/images/logo.png'])
+
+    def test_nested_initial_item(self):
+        loader = ItemLoader(item={'name': 'foo'}, selector=self.selector)
+        nl1 = loader.nested_xpath('//header')
+        nl2 = nl1.nested_css('div')
+        nl2.add_xpath('name', 'text()')
+
+        self.assertEqual(loader.get_collected_values('name'), ['foo', 'marta'])
+        self.assertEqual(loader.load_item(), {'name': ['foo', 'marta']})
@@ -1,4 +1,6 @@
+import gc
 import unittest
+import weakref
 
 from itemloaders.processors import (Compose, Identity, Join,
                                     MapCompose, TakeFirst)
@@ -45,3 +47,17 @@ class ProcessorsTest(unittest.TestCase):
         self.assertRaises(ValueError, proc, [1])
         proc = MapCompose(filter_world, lambda x: x + 1)
         self.assertRaises(ValueError, proc, 'hello')
+
+    def test_composed_functions_not_kept_alive(self):
+        class Upper:
+            def __call__(self, value, loader_context=None):
+                return value.upper()
+
+        for processor_class, expected in ((Compose, 'HELLO'), (MapCompose, ['HELLO'])):
+            function = Upper()
+            proc = processor_class(function)
+            self.assertEqual(proc('hello'), expected)
+            function_ref = weakref.ref(function)
+            del function, proc
+            gc.collect()
+            self.assertIsNone(function_ref())
@@ -1,5 +1,7 @@
 import unittest
 
+import jmespath
+
 from itemloaders.processors import SelectJmes
 
 
@@ -26,3 +28,11 @@ class SelectJmesTestCase(unittest.TestCase):
                 expected,
                 msg='test "{}" got {} expected {}'.format(l, test, expected)
             )
+
+    def test_precompiled(self):
+        proc = SelectJmes(jmespath.compile('foo.bar'))
+        self.assertEqual(proc.json_path, 'foo.bar')
+        self.assertEqual(proc({"foo": {"bar": "baz"}}), "baz")
+
+    def test_invalid_path_type(self):
+        self.assertRaises(TypeError, SelectJmes, object())
@@ -1,5 +1,7 @@
 import unittest
 
+from lxml import etree
+from lxml.cssselect import CSSSelector
 from parsel import Selector
 
 from itemloaders import ItemLoader
@@ -159,3 +161,113 @@ class SelectortemLoaderTest(unittest.TestCase):
         self.assertEqual(loader.get_output_value('url'), ['http://www.scrapy.org'])
         loader.replace_css('url', 'a::attr(href)', re=r'http://www\.(.+)')
         self.assertEqual(loader.get_output_value('url'), ['scrapy.org'])
+
+    def test_get_xpath_matches_selector(self):
+        loader = CustomItemLoader(selector=self.selector)
+        for xpath in (
+            '//p', '//p/text()', '//a/@href', '//img/@*', '//body/*', '//body//text()',
+            'count(//p)', 'boolean(//p)', 'string(//a/@href)', 'name(//div)',
+            '//div/@id | //p/text()', '//*[re:test(@src, "\\.png$")]/@alt', '//nothing',
+        ):
+            self.assertEqual(loader.get_xpath(xpath), self.selector.xpath(xpath).getall(), xpath)
+        self.assertEqual(
+            loader.get_xpath('id($id)/text()', id='id'),
+            self.selector.xpath('id($id)/text()', id='id').getall(),
+        )
+
+    def test_get_css_matches_selector(self):
+        loader = CustomItemLoader(selector=self.selector)
+        for css in (
+            'p', 'p::text', 'a::attr(href)', 'img::attr(alt)', 'body > *', 'body *::text',
+            '#id', 'div#id::text', 'p, div', 'a[href^="http"]', 'nothing',
+        ):
+            self.assertEqual(loader.get_css(css), self.selector.css(css).getall(), css)
+
+    def test_nested_matches_selector(self):
+        loader = CustomItemLoader(selector=self.selector)
+        nested = loader.nested_xpath('//body/*')
+        selector = self.selector.xpath('//body/*')
+        for xpath in ('.', './text()', '@*', 'name()', '../p'):
+            self.assertEqual(nested.get_xpath(xpath), selector.xpath(xpath).getall(), xpath)
+        for css in ('*', '::text', 'div::text', 'a::attr(href)'):
+            self.assertEqual(nested.get_css(css), selector.css(css).getall(), css)
+
+    def test_xml_matches_selector(self):
+        selector = Selector(
+            text='<root xmlns:x="http://example.com/x"><x:a b="2">1</x:a><c>3</c></root>',
+            type='xml',
+        )
+        selector.register_namespace('x', 'http://example.com/x')
+        loader = CustomItemLoader(selector=selector)
+        for xpath in ('//x:a', '//x:a/text()', '//x:a/@b', '//c', 'count(//*)', '/root/*'):
+            self.assertEqual(loader.get_xpath(xpath), selector.xpath(xpath).getall(), xpath)
+        for css in ('c', 'c::text', 'root > *'):
+            self.assertEqual(loader.get_css(css), selector.css(css).getall(), css)
+
+    def test_selector_subclass(self):
+        queries = []
+
+        class RecordingSelector(Selector):
+            def xpath(self, query, *args, **kwargs):
+                queries.append(query)
+                return super().xpath(query, *args, **kwargs)
+
+        loader = CustomItemLoader(selector=RecordingSelector(text=self.selector.get()))
+        self.assertEqual(loader.get_xpath('//p/text()'), ['paragraph'])
+        self.assertEqual(loader.get_xpath(etree.XPath('//div/text()')), ['marta'])
+        self.assertEqual(loader.get_css('a::attr(href)'), ['http://www.scrapy.org'])
+        self.assertEqual(queries[:2], ['//p/text()', '//div/text()'])
+        self.assertEqual(len(queries), 3)
+        nested = loader.nested_xpath('//body')
+        del queries[:]
+        self.assertEqual(nested.get_xpath('p/text()'), ['paragraph'])
+        self.assertEqual(queries, ['p/text()'])
+
+    def test_get_xpath_error(self):
+        loader = CustomItemLoader(selector=self.selector)
+        self.assertRaises(ValueError, loader.get_xpath, '//p[')
+        self.assertRaises(ValueError, loader.get_xpath, '$undefined')
+
+    def test_get_xpath_namespaces(self):
+        selector = Selector(
+            text='<root xmlns:x="http://example.com/x"><x:a>1</x:a></root>',
+            type='xml',
+        )
+        loader = CustomItemLoader(selector=selector)
+        self.assertEqual(
+            loader.get_xpath('//y:a/text()', namespaces={'y': 'http://example.com/x'}),
+            ['1'],
+        )
+        selector.register_namespace('z', 'http://example.com/x')
+        self.assertEqual(loader.get_xpath('//z:a/text()'), ['1'])
+
+    def test_compiled_xpath(self):
+        loader = CustomItemLoader(selector=self.selector)
+        loader.add_xpath('name', etree.XPath('//div/text()'))
+        self.assertEqual(loader.get_output_value('name'), ['Marta'])
+        loader.replace_xpath('name', [etree.XPath('//p/text()'), '//div/text()'])
+        self.assertEqual(loader.get_output_value('name'), ['Paragraph', 'Marta'])
+        self.assertEqual(loader.get_xpath(etree.XPath('//p')), ['<p>paragraph</p>'])
+        self.assertEqual(loader.get_xpath(etree.XPath('id($id)/text()'), id='id'), ['marta'])
+        self.assertRaises(ValueError, loader.get_xpath, etree.XPath('$undefined'))
+
+    def test_compiled_css(self):
+        loader = CustomItemLoader(selector=self.selector)
+        loader.add_css('name', CSSSelector('div'))
+        self.assertEqual(loader.get_output_value('name'), ['<Div Id="Id">Marta</Div>'])
+        loader.replace_css('name', etree.XPath('//p/text()'))
+        self.assertEqual(loader.get_output_value('name'), ['Paragraph'])
+        self.assertEqual(loader.get_css(CSSSelector('p')), ['<p>paragraph</p>'])
+
+    def test_combine_multi_xpath(self):
+        class CombiningItemLoader(CustomItemLoader):
+            combine_multi_xpath = True
+
+        loader = CombiningItemLoader(selector=self.selector)
+        self.assertEqual(loader.get_xpath(['//p/text()', '//div/text()']), ['marta', 'paragraph'])
+        self.assertEqual(loader.get_xpath(['//p/text()', '//p/text()']), ['paragraph'])
+        self.assertEqual(loader.get_xpath(('//p/text()', 'count(//p)')), ['paragraph', '1.0'])
+        self.assertEqual(loader.get_xpath(('id($id)/text()', '//p/text()'), id='id'), ['marta', 'paragraph'])
+        loader.add_xpath('url', ['//img/@src', '//a/@href'])
+        self.assertEqual(loader.get_output_value('url'), ['http://www.scrapy.org', '/images/logo.png'])
+        self.assertRaises(ValueError, loader.get_xpath, ['//p/text()', '//p['])